@@ -1,7 +1,8 @@
 """__init__"""
 from .nsescraper import *
+from .analytics import indicators, screener
 
 __version__ = '0.0.8'
 __maintainer__ = 'Ujjwal Chowdhury'
 
-__all__ = ['intraday_index','intraday_stock','historical_index','historical_stock','Stock']
+__all__ = ['intraday_index','intraday_stock','historical_index','historical_stock','index_constituents','sync_announcements','indicators','screener','Stock']
@@ -0,0 +1,130 @@
+# Importing Necessary Libraries
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+from .nsescraper import ValueError
+from . import store
+
+# Column names used by historical_ohlc/historical_stock mapped to the trade_reports names
+ALIASES = {'52wh'                  : '52week_high',
+           '52wl'                  : '52week_low',
+           'value'                 : 'turnover',
+           'volume'                : 'total_traded_qty',
+           '%dly_qt_to_traded_qty' : 'delivery_pct'}
+
+NUMERIC = ['open', 'high', 'low', 'close', 'vwap', 'prev_close', '52week_high', '52week_low',
+           'turnover', 'total_traded_qty', 'deliverable_qty', 'delivery_pct']
+
+
+def _panel(panel:pd.DataFrame) -> pd.DataFrame:
+    """Normalises column names/dtypes and merges the stacked panel into one row per symbol and date."""
+    if not {'symbol', 'date', 'close'}.issubset(panel.columns):
+        raise ValueError("Error: The panel needs at least 'symbol', 'date' and 'close' columns.")
+    panel = panel.loc[:, ~panel.columns.duplicated()].copy()
+    for column in NUMERIC + list(ALIASES):
+        if column in panel.columns and not pd.api.types.is_numeric_dtype(panel[column]):
+            panel[column] = pd.to_numeric(panel[column].astype(str).str.replace(',', '').str.strip(),
+                                          errors= 'coerce')
+    # Rows of trade_reports and historical_ohlc frames carry the same figure under different names
+    for alias, column in ALIASES.items():
+        if alias in panel.columns and column in panel.columns:
+            panel[column] = panel[column].combine_first(panel.pop(alias))
+    panel         = panel.rename(columns= ALIASES)
+    panel['date'] = pd.to_datetime(panel['date'])
+    # Each source fills in its own columns of a symbol/date, the latest non-null value wins
+    return (panel.groupby(['symbol', 'date'], sort= True)
+                 .last()
+                 .reset_index())
+
+
+class _GroupWindow(BaseIndexer):
+    """Trailing window that never reaches back past the first row of the current symbol."""
+    def get_window_bounds(self, num_values, min_periods, center, closed, step):
+        end   = np.arange(1, num_values + 1, dtype= np.int64)
+        start = np.maximum(end - self.window_size, self.group_start).astype(np.int64)
+        return start, end
+
+
+def _rolling(column:pd.Series,
+             group_start:np.ndarray,
+             window:int,
+             how:str,
+             min_periods:int = None) -> np.ndarray:
+    """Grouped rolling aggregate of one column for all symbols in a single pass over the panel."""
+    indexer = _GroupWindow(window_size= window, group_start= group_start)
+    rolled  = getattr(column.rolling(indexer,
+                                     min_periods= window if min_periods is None else min_periods), how)()
+    return rolled.to_numpy()
+
+
+def indicators(panel:pd.DataFrame,
+               window:int            = 20,
+               spike_threshold:float = 2.0,
+               return_periods:tuple  = (1, 5, 20),
+               year:int              = 252) -> pd.DataFrame:
+    """This function computes the standard screening indicators for every symbol of a stacked panel at once.
+
+    The panel is the concatenation of Stock.trade_reports and/or Stock.historical_ohlc frames
+    for any number of symbols (rows of both for the same day are merged), or the directory of a store filled by 'nsescraper sync' (its
+    'delivery' dataset is used). Indicators are only added when their source columns exist.
+
+    Args:
+        panel (pd.DataFrame | str): Stacked daily data with at least 'symbol', 'date' and 'close', or a store directory.
+        window (int, optional): Rolling window in trading days for the delivery/turnover baselines. Defaults to 20.
+        spike_threshold (float, optional): Z-score above which a delivery spike is flagged. Defaults to 2.0.
+        return_periods (tuple, optional): Periods in trading days for the returns. Defaults to (1, 5, 20).
+        year (int, optional): Trading days used when the 52 week high/low has to be computed. Defaults to 252.
+
+    Returns:
+        pd.DataFrame: The sorted panel with the indicator columns appended.
+    """
+    if not isinstance(panel, pd.DataFrame):
+        panel = store.read(panel, 'delivery')
+    panel       = _panel(panel)
+    grouped     = panel.groupby('symbol', sort= False)
+    codes       = grouped.ngroup().to_numpy()
+    first       = np.ones(len(panel), dtype= bool)
+    first[1:]   = codes[1:] != codes[:-1]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(panel)), 0))
+    for period in return_periods:
+        panel[f'return_{period}d'] = grouped['close'].pct_change(period, fill_method= None)
+    if 'vwap' in panel.columns:
+        panel['vwap_deviation'] = panel['close'] / panel['vwap'] - 1
+    if '52week_high' not in panel.columns and 'high' in panel.columns:
+        panel['52week_high'] = _rolling(panel['high'], group_start, year, 'max', min_periods= 1)
+    if '52week_low' not in panel.columns and 'low' in panel.columns:
+        panel['52week_low'] = _rolling(panel['low'], group_start, year, 'min', min_periods= 1)
+    if '52week_high' in panel.columns:
+        panel['pct_from_52week_high'] = panel['close'] / panel['52week_high'] - 1
+    if '52week_low' in panel.columns:
+        panel['pct_from_52week_low'] = panel['close'] / panel['52week_low'] - 1
+    # Baselines are taken over the previous 'window' sessions so that today's value is compared against them
+    if 'delivery_pct' in panel.columns:
+        mean = np.roll(_rolling(panel['delivery_pct'], group_start, window, 'mean'), 1)
+        std  = np.roll(_rolling(panel['delivery_pct'], group_start, window, 'std'), 1)
+        mean[first] = np.nan
+        std[first]  = np.nan
+        with np.errstate(divide= 'ignore', invalid= 'ignore'):
+            panel['delivery_zscore'] = (panel['delivery_pct'].to_numpy() - mean) / std
+        panel['delivery_spike'] = panel['delivery_zscore'] >= spike_threshold
+    if 'turnover' in panel.columns:
+        mean = np.roll(_rolling(panel['turnover'], group_start, window, 'mean'), 1)
+        mean[first] = np.nan
+        with np.errstate(divide= 'ignore', invalid= 'ignore'):
+            panel['turnover_ratio'] = panel['turnover'].to_numpy() / mean
+    return panel
+
+
+def screener(panel:pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """This function returns the latest indicator row of every symbol in the panel.
+
+    Args:
+        panel (pd.DataFrame | str): Stacked daily data or a store directory, see indicators().
+        **kwargs: Passed on to indicators().
+
+    Returns:
+        pd.DataFrame: One row per symbol.
+    """
+    return (indicators(panel, **kwargs)
+            .drop_duplicates('symbol', keep= 'last')
+            .reset_index(drop= True))
@@ -0,0 +1,287 @@
+# Importing Necessary Libraries
+import argparse
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from . import store
+from .nsescraper import Stock, historical_index, intraday_index, index_constituents, ValueError, HERE
+
+DATASETS = ['ohlc', 'delivery', 'deals', 'index', 'intraday']
+
+# Datasets of the --universe index itself rather than of its constituents
+INDEX_DATASETS = {'index', 'intraday'}
+
+# NSE serves at most one year per request
+CHUNK_DAYS = 365
+
+
+def _chunks(since:datetime, until:datetime) -> list:
+    """Splits the date range into "DD-MM-YYYY" windows of at most CHUNK_DAYS days."""
+    chunks = []
+    while since <= until:
+        end = min(since + timedelta(days= CHUNK_DAYS - 1), until)
+        chunks.append((since.strftime('%d-%m-%Y'), end.strftime('%d-%m-%Y')))
+        since = end + timedelta(days= 1)
+    return chunks
+
+
+def date(value:str) -> datetime:
+    """"YYYY-MM-DD" command line dates."""
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def _numeric(frame:pd.DataFrame, skip:list) -> pd.DataFrame:
+    """Turns the comma separated number columns into floats so that every chunk stores the same dtypes."""
+    for column in frame.columns:
+        if column not in skip and (pd.api.types.is_object_dtype(frame[column])
+                                   or pd.api.types.is_string_dtype(frame[column])):
+            frame[column] = pd.to_numeric(frame[column].astype(str).str.replace(',', '').str.strip(),
+                                          errors= 'coerce')
+    return frame
+
+
+def _fetch(dataset:str, stock:Stock, name:str, from_date:str, to_date:str) -> pd.DataFrame:
+    try:
+        if dataset == 'ohlc':
+            return _numeric(stock.historical_ohlc(from_date, to_date), ['date', 'series', 'symbol'])
+        if dataset == 'delivery':
+            frame         = stock.trade_reports(from_date, to_date)
+            frame['date'] = pd.to_datetime(frame['date'])
+            return frame
+        if dataset == 'deals':
+            return stock.bulk_deals(from_date, to_date)
+        if dataset == 'intraday':
+            frame = intraday_index(name)
+        else:
+            frame = historical_index(name, from_date, to_date)
+    except ValueError:
+        # Raised by the scrapers when the window holds no data
+        return None
+    if frame is None:
+        # The index scrapers return None for index names they do not support
+        raise SystemExit(f"Error: '{name}' is not a supported index.")
+    if dataset == 'intraday':
+        frame.insert(0, 'index_name', name.upper())
+    return frame
+
+
+def _write(dataset:str, key:str, root:str, frames:list) -> int:
+    # Windows that failed come in as None, the others are stored all the same
+    frames = [frame for frame in frames if frame is not None and len(frame) > 0]
+    if len(frames) <= 0:
+        return 0
+    frame = pd.concat(frames, ignore_index= True)
+    store.write(root, dataset, key, frame)
+    return len(frame)
+
+
+def resolve_jobs(names:list) -> dict:
+    """This function builds one ('resolve', name) job per stock name, looking up its NSE symbol.
+
+    Names differing only by case or spaces are looked up once.
+
+    Returns:
+        dict: {key: (function, [dependency keys], partial)}, see build_jobs().
+    """
+    jobs = {}
+    for name in dict.fromkeys(name.upper().replace(' ', '') for name in names):
+        jobs[('resolve', name)] = (lambda results, name= name: Stock(name).symbol_finder(), [], False)
+    return jobs
+
+
+def build_jobs(symbols:list,
+               datasets:list,
+               since:datetime,
+               until:datetime,
+               root:str,
+               universe:str = None) -> dict:
+    """This function builds the de-duplicated job graph of a sync.
+
+    Every job is keyed by a tuple of NSE symbol, dataset and window, so anything asked for twice
+    is fetched once and every store file has a single writer. A ('write', dataset, symbol) job
+    depends on all the fetch jobs of that symbol and dataset, and stores whichever windows succeeded.
+
+    Args:
+        symbols (list): NSE symbols, stock names have to be resolved first (see resolve_jobs()).
+
+    Returns:
+        dict: {key: (function, [dependency keys], partial)}. The function takes the dependency results,
+              a partial job also runs when some (not all) of its dependencies failed.
+    """
+    jobs   = {}
+    chunks = _chunks(since, until)
+    for symbol in dict.fromkeys(symbols):
+        stock        = Stock(symbol)
+        stock.symbol = symbol
+        for dataset in dict.fromkeys(datasets):
+            if dataset in INDEX_DATASETS:
+                continue
+            fetches = []
+            for from_date, to_date in chunks:
+                key       = (dataset, symbol, from_date, to_date)
+                jobs[key] = (lambda results, dataset= dataset, stock= stock, from_date= from_date, to_date= to_date:
+                                 _fetch(dataset, stock, None, from_date, to_date), [], False)
+                fetches.append(key)
+            jobs[('write', dataset, symbol)] = (lambda results, dataset= dataset, symbol= symbol:
+                                                    _write(dataset, symbol, root, results), fetches, True)
+    if universe and 'index' in datasets:
+        fetches = []
+        for from_date, to_date in chunks:
+            key       = ('index', universe, from_date, to_date)
+            jobs[key] = (lambda results, from_date= from_date, to_date= to_date:
+                             _fetch('index', None, universe, from_date, to_date), [], False)
+            fetches.append(key)
+        jobs[('write', 'index', universe)] = (lambda results: _write('index', universe.upper(), root, results),
+                                              fetches, True)
+    if universe and 'intraday' in datasets:
+        # Today's candles only, there are no windows to split
+        jobs[('intraday', universe)]          = (lambda results: _fetch('intraday', None, universe, None, None),
+                                                 [], False)
+        jobs[('write', 'intraday', universe)] = (lambda results: _write('intraday', universe.upper(), root, results),
+                                                 [('intraday', universe)], False)
+    return jobs
+
+
+def run_jobs(jobs:dict, workers:int = 8) -> dict:
+    """This function runs the job graph on a thread pool, starting every job as soon as its dependencies are done.
+
+    A job whose dependency failed is skipped, unless it is a partial job with at least one
+    dependency that succeeded; it then gets None for the failed ones.
+
+    Returns:
+        dict: {key: {'result', 'error', 'latency', 'skipped'}}
+    """
+    waiting    = {key: set(job[1]) for key, job in jobs.items()}
+    dependents = {key: [] for key in jobs}
+    for key, job in jobs.items():
+        for dep in job[1]:
+            dependents[dep].append(key)
+    report  = {}
+    running = {}
+
+    def timed(key):
+        start  = time.perf_counter()
+        result = jobs[key][0]([report[dep]['result'] for dep in jobs[key][1]])
+        return result, time.perf_counter() - start
+
+    def finished(key, pool):
+        for child in dependents[key]:
+            waiting[child].discard(key)
+            if waiting[child] or child in report:
+                continue
+            deps = jobs[child][1]
+            if all(report[dep]['error'] is None for dep in deps):
+                running[pool.submit(timed, child)] = child
+            elif jobs[child][2] and any(report[dep]['error'] is None for dep in deps):
+                running[pool.submit(timed, child)] = child
+            else:
+                failed = next(dep for dep in deps if report[dep]['error'] is not None)
+                report[child] = {'result': None, 'error': f"{failed} failed", 'latency': None, 'skipped': True}
+                finished(child, pool)
+
+    with ThreadPoolExecutor(max_workers= workers) as pool:
+        for key, deps in waiting.items():
+            if not deps:
+                running[pool.submit(timed, key)] = key
+        while running:
+            done, _ = wait(running, return_when= FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    result, latency = future.result()
+                    report[key]     = {'result': result, 'error': None, 'latency': latency, 'skipped': False}
+                except (Exception, SystemExit) as e:
+                    report[key]     = {'result': None, 'error': repr(e), 'latency': None, 'skipped': False}
+                finished(key, pool)
+    return report
+
+
+def summary(report:dict, elapsed:float) -> str:
+    """Formats the throughput and per job type latency stats of a finished sync."""
+    rows  = sum(value['result'] or 0 for key, value in report.items() if key[0] == 'write')
+    lines = [f"{len(report)} jobs in {elapsed:.1f}s "
+             f"({len(report) / elapsed if elapsed else 0:.1f} jobs/s, "
+             f"{rows / elapsed if elapsed else 0:.0f} rows/s), {rows} rows written",
+             f"{'job':<10}{'done':>6}{'failed':>8}{'skipped':>9}{'p50 (s)':>10}{'p95 (s)':>10}{'max (s)':>10}"]
+    for kind in dict.fromkeys(key[0] for key in report):
+        values  = [value for key, value in report.items() if key[0] == kind]
+        latency = np.array([value['latency'] for value in values if value['error'] is None])
+        failed  = sum(1 for value in values if value['error'] is not None and not value['skipped'])
+        skipped = sum(1 for value in values if value['skipped'])
+        if len(latency):
+            p50, p95, top = np.percentile(latency, 50), np.percentile(latency, 95), latency.max()
+            lines.append(f"{kind:<10}{len(latency):>6}{failed:>8}{skipped:>9}{p50:>10.2f}{p95:>10.2f}{top:>10.2f}")
+        else:
+            lines.append(f"{kind:<10}{0:>6}{failed:>8}{skipped:>9}{'-':>10}{'-':>10}{'-':>10}")
+    for key, value in report.items():
+        if value['error'] is not None and not value['skipped']:
+            lines.append(f"failed {key}: {value['error']}")
+    return '\n'.join(lines)
+
+
+def sync(args) -> int:
+    datasets = [dataset.strip() for dataset in args.datasets.split(',') if dataset.strip()]
+    unknown  = set(datasets) - set(DATASETS)
+    if unknown:
+        raise SystemExit(f"Error: Unknown datasets {sorted(unknown)}. Please try among these: {DATASETS}")
+    start   = time.perf_counter()
+    symbols = []
+    report  = {}
+    if set(datasets) - INDEX_DATASETS:
+        try:
+            symbols = index_constituents(args.universe) if args.universe else []
+        except ValueError as e:
+            raise SystemExit(e.args[0]) from None
+        known = set(symbols)
+        names = [name for name in args.symbols if name.upper().replace(' ', '') not in known]
+        # Stock names are resolved first so that every fetch and write is keyed by its NSE symbol
+        if names:
+            report   = run_jobs(resolve_jobs(names), args.workers)
+            symbols += [value['result'] for value in report.values() if value['error'] is None]
+    jobs     = build_jobs(symbols, datasets, args.since, args.until, args.store, args.universe)
+    report.update(run_jobs(jobs, args.workers))
+    print(summary(report, time.perf_counter() - start))
+    return 1 if any(value['error'] is not None for value in report.values()) else 0
+
+
+def main(argv:list = None) -> int:
+    today    = datetime.today().replace(hour= 0, minute= 0, second= 0, microsecond= 0)
+    parser   = argparse.ArgumentParser(prog= 'nsescraper',
+                                       description= 'A scraper for https://www.nseindia.com')
+    commands = parser.add_subparsers(dest= 'command', required= True)
+    command  = commands.add_parser('sync',
+                                   help= 'Download datasets for many stocks in parallel into a local parquet store.')
+    command.add_argument('--universe', help= 'NSE index whose constituents (and, with the index/intraday '
+                                             'datasets, history and today\'s candles) are synced, e.g. "NIFTY 500".')
+    command.add_argument('--symbols', help= 'Comma separated extra stock names/symbols.')
+    command.add_argument('--datasets', default= 'ohlc,delivery,deals',
+                         help= f'Comma separated datasets among {",".join(DATASETS)}. Defaults to ohlc,delivery,deals.')
+    command.add_argument('--since', type= date, default= today - timedelta(days= 365),
+                         help= 'Starting date in "YYYY-MM-DD" format. Defaults to one year ago.')
+    command.add_argument('--until', type= date, default= today,
+                         help= 'Ending date in "YYYY-MM-DD" format. Defaults to today.')
+    command.add_argument('--store', default= 'nse_store', help= 'Store directory. Defaults to nse_store.')
+    command.add_argument('--workers', type= int, default= 8, help= 'Parallel requests. Defaults to 8.')
+    args = parser.parse_args(argv)
+    if not (args.universe or args.symbols):
+        parser.error('Please give --universe and/or --symbols.')
+    index_datasets = INDEX_DATASETS.intersection(dataset.strip() for dataset in args.datasets.split(','))
+    if index_datasets and not args.universe:
+        parser.error(f"The {sorted(index_datasets)} datasets need --universe.")
+    if index_datasets:
+        with open(HERE / 'nifty_indices.pickle', 'rb') as file:
+            nifty_indices = pickle.load(file)
+        if args.universe.upper() not in nifty_indices:
+            parser.error(f"The {sorted(index_datasets)} datasets are not available for '{args.universe}'. "
+                         f"Please try among these: {sorted(nifty_indices)}")
+    if args.since > args.until:
+        parser.error('Starting date (--since) should be earlier than ending date (--until).')
+    args.symbols = [symbol.strip() for symbol in (args.symbols or '').split(',') if symbol.strip()]
+    return sync(args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
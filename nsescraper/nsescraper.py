@@ -9,6 +9,12 @@ from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 from io import StringIO
 import dateutil.parser as parser
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 # Getting the file path
 HERE = pathlib.Path(__file__).parent.resolve()
@@ -39,6 +45,7 @@ class Stock():
         self.adapter          = (HTTPAdapter(max_retries=self.retry))
         self.search_url       = 'https://www.nseindia.com/api/search/autocomplete?q={}'
         self.get_details      = 'https://www.nseindia.com/api/quote-equity?symbol={}'
+        self.symbol           = None
     
     def identifier_finder(self):
         name = self.identifier.replace(' ', '')
@@ -66,6 +73,9 @@ class Stock():
             session.close()
     
     def symbol_finder(self):
+        # The symbol is looked up once per Stock and reused by every scraper method
+        if self.symbol:
+            return self.symbol
         company_name   = self.identifier.replace(' ', '')
         session        = requests.Session()
         session.mount('https://',
@@ -76,7 +86,8 @@ class Stock():
             search_results = session.get(url     = self.search_url.format(company_name),
                                          headers = self.head)
             search_result  = search_results.json()['symbols'][0]['symbol']
-            return str(search_result)
+            self.symbol    = str(search_result)
+            return self.symbol
         except requests.exceptions.RequestException as e:
             raise SystemExit(e)
         except (IndexError, KeyError) as e:
@@ -131,7 +142,12 @@ class Stock():
                        + "&csv=true")
             webdata = session.get(url     = url,
                                   headers = self.head)
-            company_historical_dataframe         = pd.read_csv(StringIO(webdata.text[3:]))
+            try:
+                company_historical_dataframe     = pd.read_csv(StringIO(webdata.text[3:]))
+            except pd.errors.EmptyDataError:
+                company_historical_dataframe     = pd.DataFrame()
+            if len(company_historical_dataframe) <= 0:
+                raise ValueError(f"Data not found in between {from_date} to {to_date}")
             company_historical_dataframe.columns = [str(x).lower().replace(' ','') for x in company_historical_dataframe.columns]
             company_historical_dataframe['date'] = pd.to_datetime(company_historical_dataframe['date'],
                                                                   format   = self.date_format)
@@ -227,6 +243,8 @@ class Stock():
             res = session.get(url     = url,
                               headers = self.head).json()
             res = pd.DataFrame(res['data'])
+            if len(res) <= 0:
+                raise ValueError(f"Data not found in between {from_date} to {to_date}")
             res.rename(columns= {'CH_SYMBOL':'symbol',
                                  'CH_TIMESTAMP':'date',
                                  'COP_DELIV_QTY':'deliverable_qty',
@@ -392,6 +410,29 @@ class Stock():
         finally:
             session.close()
 
+    def sync_announcements(self,
+                           store:str                = 'nse_announcements',
+                           download_attachments:bool = True,
+                           max_workers:int          = 8,
+                           max_file_size:int        = 25 * 1024 * 1024
+                          ) -> pd.DataFrame:
+        """This function fetches only the announcements published since the last sync for this stock.
+
+        Args:
+            store (str, optional): Directory holding the sync watermarks and attachments. Defaults to 'nse_announcements'.
+            download_attachments (bool, optional): If True downloads the attachment files concurrently. Defaults to True.
+            max_workers (int, optional): Number of parallel attachment downloads. Defaults to 8.
+            max_file_size (int, optional): Attachments larger than this many bytes are skipped. Defaults to 25 MB.
+
+        Returns:
+            pd.DataFrame: New announcements only.
+        """
+        return sync_announcements(stock_name           = self,
+                                  store                = store,
+                                  download_attachments = download_attachments,
+                                  max_workers          = max_workers,
+                                  max_file_size        = max_file_size)
+
 
 
 
@@ -645,6 +686,8 @@ def historical_index(index_name:str,
                     "&from=" + from_date + "&to=" + to_date,
                 headers=head)
             output_dataframe = pd.DataFrame(index_data_json.json()['data']['indexCloseOnlineRecords'])
+            if len(output_dataframe) <= 0:
+                raise ValueError(f"Data not found in between {from_date} to {to_date}")
             output_dataframe.rename({'EOD_INDEX_NAME':'index_name',
                                      'EOD_OPEN_INDEX_VAL':'open',
                                      'EOD_HIGH_INDEX_VAL':'high',
@@ -661,4 +704,225 @@ def historical_index(index_name:str,
             raise SystemExit(e)
     else:
         print(f"""Ignoring further execution for '{index_name}'. Not a valid index name !!!!!.
-              Please try amonng these: {sorted(nifty_indices)}""")
\ No newline at end of file
+              Please try amonng these: {sorted(nifty_indices)}""")
+
+def index_constituents(index_name:str)->list:
+    """This function scrapes the symbols of the stocks making up the given nse index_name.
+
+    Args:
+        index_name (str): NSE Index name (For Example:- NIFTY 50, NIFTY 500, NIFTY BANK, NIFTY NEXT 50.)
+
+    Returns:
+        list: NSE symbols of the index constituents.
+    """
+    session        = requests.Session()
+    max_retries    = 5
+    backoff_factor = 0.5
+    retry          = Retry(total             = max_retries,
+                           backoff_factor    = backoff_factor,
+                           status_forcelist  = [500, 502, 503, 504])
+    adapter        = HTTPAdapter(max_retries = retry)
+    session.mount('https://', adapter)
+    head = {
+        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/87.0.4280.88 Safari/537.36 "
+    }
+    try:
+        session.get("https://www.nseindia.com",
+                    headers = head)
+        index_data_json = session.get(url     = "https://www.nseindia.com/api/equity-stockIndices?index="
+                                                + index_name.upper().replace(' ', '%20').replace('&', '%26'),
+                                      headers = head).json()
+        # The first record is the index itself
+        return [record['symbol'] for record in index_data_json['data']
+                if record['symbol'] != index_name.upper()]
+    except requests.exceptions.RequestException as e:
+        raise SystemExit(e)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Error: Constituents not found for '{index_name}'. Please try with a valid index name.") from None
+    finally:
+        session.close()
+
+
+def sync_announcements(stock_name                = None,
+                       store:str                = 'nse_announcements',
+                       download_attachments:bool = True,
+                       max_workers:int          = 8,
+                       max_file_size:int        = 25 * 1024 * 1024,
+                       lookback:int             = 100)->pd.DataFrame:
+    """This function fetches only the corporate announcements published since the previous sync.
+
+    A watermark on 'timestamp' is kept per stock (or market wide when no stock name is given) in
+    'watermarks/<symbol>.json' inside the store directory, and already seen announcements are dropped
+    by their content hash. Attachments are streamed concurrently into 'attachments/' under a
+    content addressed layout (sha256 of the file). Announcements whose attachment download failed
+    are returned again by the next sync, until the download succeeds.
+
+    Args:
+        stock_name (str | Stock, optional): Company/Stock name or Stock. Defaults to None (all listed companies).
+        store (str, optional): Directory holding the sync watermarks and attachments. Defaults to 'nse_announcements'.
+        download_attachments (bool, optional): If True downloads the attachment files concurrently. Defaults to True.
+        max_workers (int, optional): Number of parallel attachment downloads. Defaults to 8.
+        max_file_size (int, optional): Attachments larger than this many bytes are skipped. Defaults to 25 MB.
+        lookback (int, optional): Days fetched on the very first sync. Defaults to 100.
+
+    Returns:
+        pd.DataFrame: New announcements only, with 'content_hash' and 'attachment_path' (None when not downloaded).
+    """
+    store      = pathlib.Path(store)
+    if stock_name is None:
+        symbol = None
+    elif isinstance(stock_name, Stock):
+        symbol = stock_name.symbol_finder()
+    else:
+        symbol = Stock(stock_name).symbol_finder()
+    # One state file per key, so that pollers of different stocks never overwrite each other
+    state_file = store / 'watermarks' / ((symbol if symbol else 'ALL').replace('/', '_') + '.json')
+    state      = json.loads(state_file.read_text()) if state_file.exists() else {}
+    watermark  = state.get('watermark')
+    seen       = set(state.get('seen', []))
+    to_date    = datetime.today().date()
+    from_date  = (pd.Timestamp(watermark).date() if watermark 
+                  else to_date - timedelta(days=lookback))
+    url        = ("https://www.nseindia.com/api/corporate-announcements?index=equities&from_date="
+                  + from_date.strftime('%d-%m-%Y')
+                  + "&to_date="
+                  + to_date.strftime('%d-%m-%Y'))
+    if symbol:
+        url += "&symbol=" + symbol
+    session        = requests.Session()
+    max_retries    = 10
+    backoff_factor = 0.5
+    retry          = Retry(total             = max_retries,
+                           backoff_factor    = backoff_factor,
+                           status_forcelist  = [500, 502, 503, 504])
+    adapter        = HTTPAdapter(max_retries = retry)
+    session.mount('https://', adapter)
+    head = {
+        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/87.0.4280.88 Safari/537.36 "
+    }
+    try:
+        session.get("https://www.nseindia.com",
+                    headers = head)
+        res_ = pd.DataFrame(session.get(url     = url,
+                                        headers = head).json())
+    except requests.exceptions.RequestException as e:
+        raise SystemExit(e)
+    finally:
+        session.close()
+    columns = ['symbol',
+               'timestamp',
+               'subject',
+               'company_name',
+               'isin',
+               'industry',
+               'details',
+               'attachment']
+    if len(res_) <= 0:
+        return pd.DataFrame(columns = columns + ['content_hash','attachment_path'])
+    res_.rename(columns={'sort_date':'timestamp',
+                         'desc':'subject',
+                         'sm_name':'company_name',
+                         'sm_isin':'isin',
+                         'smIndustry':'industry',
+                         'attchmntText':'details',
+                         'attchmntFile':'attachment',
+                         }, inplace= True)
+    res_              = res_[columns].copy()
+    res_['timestamp'] = pd.to_datetime(res_['timestamp'])
+    res_['content_hash'] = [hashlib.sha256('\x1f'.join(row).encode('utf-8')).hexdigest()
+                            for row in res_[['symbol',
+                                             'timestamp',
+                                             'subject',
+                                             'details',
+                                             'attachment']].astype(str).itertuples(index= False)]
+    if watermark:
+        res_ = res_[res_['timestamp'] >= pd.Timestamp(watermark)]
+    fetched = res_.drop_duplicates('content_hash')
+    res_    = (fetched[~fetched['content_hash'].isin(seen)]
+               .sort_values('timestamp')
+               .reset_index(drop= True))
+    res_['attachment_path'] = None
+    if len(res_) <= 0:
+        return res_
+    failed = pd.Series(False, index= res_.index)
+    if download_attachments:
+        (store / 'attachments').mkdir(parents= True, exist_ok= True)
+        # One session shared by all the workers keeps the connections to the archive alive
+        session = requests.Session()
+        retry   = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+        session.mount('https://', HTTPAdapter(max_retries= retry,
+                                              pool_maxsize= max_workers))
+
+        def download(attachment):
+            try:
+                return _download_attachment(session, attachment, store / 'attachments', max_file_size), False
+            except requests.exceptions.RequestException:
+                return None, True
+        try:
+            with ThreadPoolExecutor(max_workers= max_workers) as pool:
+                downloads = list(pool.map(download, res_['attachment']))
+        finally:
+            session.close()
+        res_['attachment_path'] = pd.Series([path for path, error in downloads], index= res_.index, dtype= object)
+        failed                  = pd.Series([error for path, error in downloads], index= res_.index)
+    # The watermark stays at the earliest failed download so that it is fetched and retried next time,
+    # and every delivered announcement from the watermark onwards is remembered as seen
+    latest    = (res_.loc[failed, 'timestamp'].min() if failed.any()
+                 else res_['timestamp'].max())
+    delivered = set(fetched['content_hash']) - set(res_.loc[failed, 'content_hash'])
+    seen      = set(fetched.loc[(fetched['timestamp'] >= latest)
+                                & fetched['content_hash'].isin(delivered), 'content_hash'])
+    state     = {'watermark': latest.isoformat(),
+                 'seen': sorted(seen)}
+    state_file.parent.mkdir(parents= True, exist_ok= True)
+    with tempfile.NamedTemporaryFile('w', dir= state_file.parent, suffix= '.part', delete= False) as file:
+        json.dump(state, file, indent= 1)
+    os.replace(file.name, state_file)
+    return res_
+
+def _download_attachment(session:requests.Session,
+                         url:str,
+                         directory:pathlib.Path,
+                         max_file_size:int)->str:
+    """Streams one announcement attachment to 'directory/<sha256[:2]>/<sha256><suffix>'.
+
+    Returns:
+        str: Path of the stored file, None when there is no attachment, it is larger than max_file_size
+             or the server answered with a permanent client error (dead link).
+
+    Raises:
+        requests.exceptions.RequestException: When the download failed and should be retried.
+    """
+    if not isinstance(url, str) or not url.startswith('http'):
+        return None
+    head = {
+        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/87.0.4280.88 Safari/537.36 "
+    }
+    digest = hashlib.sha256()
+    size   = 0
+    file   = tempfile.NamedTemporaryFile(dir= directory, suffix= '.part', delete= False)
+    try:
+        with file, session.get(url, headers= head, stream= True, timeout= 60) as response:
+            # 4xx answers will not change on a retry, except for timeouts and rate limiting
+            if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+                return None
+            response.raise_for_status()
+            if int(response.headers.get('content-length') or 0) > max_file_size:
+                return None
+            for chunk in response.iter_content(chunk_size= 64 * 1024):
+                size += len(chunk)
+                if size > max_file_size:
+                    return None
+                digest.update(chunk)
+                file.write(chunk)
+        target = directory / digest.hexdigest()[:2] / (digest.hexdigest()
+                                                       + pathlib.PurePosixPath(urlparse(url).path).suffix.lower())
+        target.parent.mkdir(exist_ok= True)
+        os.replace(file.name, target)
+        return str(target)
+    finally:
+        if os.path.exists(file.name):
+            os.remove(file.name)
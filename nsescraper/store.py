@@ -0,0 +1,77 @@
+# Importing Necessary Libraries
+import os
+import pathlib
+import tempfile
+import pandas as pd
+
+# Columns identifying one record of every dataset kept in the store
+KEYS = {'ohlc'     : ['symbol', 'date'],
+        'delivery' : ['symbol', 'date'],
+        'deals'    : None,
+        'index'    : ['index_name', 'date'],
+        'intraday' : ['index_name', 'timestamp']}
+
+# Column the stored rows are ordered by, 'date' unless given here
+ORDER = {'intraday' : 'timestamp'}
+
+
+def _path(root:str, dataset:str, key:str) -> pathlib.Path:
+    return pathlib.Path(root) / dataset / (key.replace('/', '_') + '.parquet')
+
+
+def write(root:str,
+          dataset:str,
+          key:str,
+          frame:pd.DataFrame) -> int:
+    """This function merges a frame into the local columnar (parquet) store, one file per dataset and symbol/index.
+
+    Args:
+        root (str): Store directory.
+        dataset (str): One of 'ohlc', 'delivery', 'deals', 'index' or 'intraday'.
+        key (str): Symbol or index name the frame belongs to.
+        frame (pd.DataFrame): Rows to add, rows already stored are replaced.
+
+    Returns:
+        int: Number of rows in the stored file.
+    """
+    path = _path(root, dataset, key)
+    if path.exists():
+        frame = pd.concat([pd.read_parquet(path), frame], ignore_index= True)
+    frame = (frame.drop_duplicates(KEYS.get(dataset), keep= 'last')
+                  .sort_values(ORDER.get(dataset, 'date'), kind= 'stable')
+                  .reset_index(drop= True))
+    path.parent.mkdir(parents= True, exist_ok= True)
+    with tempfile.NamedTemporaryFile(dir= path.parent, suffix= '.part', delete= False) as file:
+        pass
+    try:
+        frame.to_parquet(file.name, index= False)
+        os.replace(file.name, path)
+    except ImportError as e:
+        raise ImportError("Error: The store needs pyarrow. Please install it with 'pip install nsescraper[store]'.") from e
+    finally:
+        if os.path.exists(file.name):
+            os.remove(file.name)
+    return len(frame)
+
+
+def read(root:str,
+         dataset:str,
+         symbols:list = None) -> pd.DataFrame:
+    """This function loads a dataset of the local store as one stacked multi-symbol frame.
+
+    Args:
+        root (str): Store directory.
+        dataset (str): One of 'ohlc', 'delivery', 'deals', 'index' or 'intraday'.
+        symbols (list, optional): Symbols/index names to load. Defaults to None (everything stored).
+
+    Returns:
+        pd.DataFrame
+    """
+    if symbols is None:
+        paths = sorted((pathlib.Path(root) / dataset).glob('*.parquet'))
+    else:
+        paths = [_path(root, dataset, symbol) for symbol in symbols]
+    frames = [pd.read_parquet(path) for path in paths if path.exists()]
+    if len(frames) <= 0:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index= True)
@@ -32,6 +32,8 @@ setup(
         ('nsescraper',['nsescraper/nifty_indices.pickle','nsescraper/option_indices.pickle','nsescraper/nsescraper.svg']),
     ],
     install_requires=['pandas','pytz','urllib3','python-dateutil'],
+    extras_require={'store': ['pyarrow']},
+    entry_points={'console_scripts': ['nsescraper=nsescraper.cli:main']},
     tests_require=['pytest'],
     keywords= ['python','NSE','NIFTY','scraping']
 )
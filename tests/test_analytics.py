@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from nsescraper import indicators, screener
+
+
+@pytest.fixture
+def panel():
+    rng   = np.random.default_rng(7)
+    frames = []
+    # Uneven histories so that windows would cross symbol boundaries if they were not bounded
+    for symbol, days in [('AAA', 45), ('BBB', 5), ('CCC', 30)]:
+        frames.append(pd.DataFrame({'symbol'                : symbol,
+                                    'date'                  : pd.bdate_range('2025-01-01', periods= days),
+                                    'close'                 : rng.uniform(100, 200, days),
+                                    'vwap'                  : rng.uniform(100, 200, days),
+                                    'high'                  : rng.uniform(100, 200, days),
+                                    'low'                   : rng.uniform(100, 200, days),
+                                    '%dly_qt_to_traded_qty' : rng.uniform(10, 90, days),
+                                    'turnover'              : rng.uniform(1e6, 1e9, days)}))
+    panel = pd.concat(frames, ignore_index= True)
+    panel.loc[10, 'close'] = np.nan
+    return panel.sample(frac= 1, random_state= 1)
+
+
+def test_grouped_rolling_matches_per_symbol_reference(panel):
+    result = indicators(panel, window= 10, year= 20)
+    for symbol, expected in panel.groupby('symbol'):
+        expected = expected.sort_values('date').reset_index(drop= True)
+        got      = result[result['symbol'] == symbol].reset_index(drop= True)
+        delivery = expected['%dly_qt_to_traded_qty']
+        zscore   = ((delivery - delivery.rolling(10).mean().shift(1))
+                    / delivery.rolling(10).std().shift(1))
+        np.testing.assert_allclose(got['delivery_zscore'], zscore)
+        np.testing.assert_allclose(got['turnover_ratio'],
+                                   expected['turnover'] / expected['turnover'].rolling(10).mean().shift(1))
+        np.testing.assert_allclose(got['52week_high'], expected['high'].rolling(20, min_periods= 1).max())
+        np.testing.assert_allclose(got['52week_low'], expected['low'].rolling(20, min_periods= 1).min())
+        np.testing.assert_allclose(got['return_5d'], expected['close'].pct_change(5, fill_method= None))
+
+
+def test_returns_are_not_computed_across_missing_closes(panel):
+    result = indicators(panel)
+    aaa    = result[result['symbol'] == 'AAA'].reset_index(drop= True)
+    assert np.isnan(aaa.loc[10, 'return_1d'])
+    assert np.isnan(aaa.loc[11, 'return_1d'])
+
+
+def test_screener_returns_latest_row_per_symbol(panel):
+    result = screener(panel)
+    assert result['symbol'].tolist() == ['AAA', 'BBB', 'CCC']
+    assert result['date'].tolist() == [pd.bdate_range('2025-01-01', periods= days)[-1] for days in (45, 5, 30)]
+
+
+def test_empty_panel(panel):
+    assert len(indicators(panel.iloc[:0])) == 0
+    assert len(screener(panel[panel['symbol'] == 'ZZZ'])) == 0
+
+
+def test_trade_reports_and_ohlc_rows_are_merged():
+    reports = pd.DataFrame({'symbol'                : 'TCS',
+                            'date'                  : ['2025-01-01', '2025-01-02'],
+                            '%dly_qt_to_traded_qty' : [50.0, 60.0],
+                            'close'                 : [10.0, 11.0],
+                            'turnover'              : [1e6, 2e6]})
+    ohlc    = pd.DataFrame({'symbol' : 'TCS',
+                            'date'   : pd.to_datetime(['2025-01-01', '2025-01-02']),
+                            'close'  : ['10', '11'],
+                            'value'  : ['1,000,000', '2,000,000'],
+                            '52wh'   : ['20', '22']})
+    result  = indicators(pd.concat([reports, ohlc]))
+    assert len(result) == 2
+    assert result['delivery_pct'].tolist() == [50.0, 60.0]
+    assert result['turnover'].tolist() == [1e6, 2e6]
+    assert result['52week_high'].tolist() == [20.0, 22.0]
+    assert 'value' not in result.columns
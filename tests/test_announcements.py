@@ -0,0 +1,131 @@
+import pathlib
+import pytest
+import requests
+import nsescraper.nsescraper as nse
+
+
+def announcement(symbol, sort_date, desc, attachment='https://nsearchives.nseindia.com/corporate/a.pdf'):
+    return {'symbol': symbol, 'sort_date': sort_date, 'desc': desc, 'sm_name': symbol, 'sm_isin': 'INE000000000',
+            'smIndustry': 'IT', 'attchmntText': desc, 'attchmntFile': attachment}
+
+
+class Response:
+    def __init__(self, payload= None, body= b'', status_code= 200):
+        self.payload     = payload
+        self.body        = body
+        self.status_code = status_code
+        self.headers     = {}
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(self.status_code)
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def nse_site(monkeypatch):
+    site = {'announcements': [], 'broken': set(), 'dead': set(), 'urls': [], 'sessions': set()}
+
+    def get(self, url= None, headers= None, stream= False, timeout= None):
+        site['urls'].append(url)
+        if stream:
+            site['sessions'].add(id(self))
+            if url in site['broken']:
+                raise requests.exceptions.ConnectionError(url)
+            if url in site['dead']:
+                return Response(status_code= 404)
+            return Response(body= url.encode())
+        if 'corporate-announcements' in url:
+            return Response([row for row in site['announcements'] if 'symbol=' not in url
+                             or url.endswith('symbol=' + row['symbol'])])
+        if 'autocomplete' in url:
+            return Response({'symbols': [{'symbol': 'TCS'}]})
+        return Response()
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return site
+
+
+def test_repeated_sync_returns_only_new_announcements(nse_site, tmp_path):
+    nse_site['announcements'] = [announcement('TCS', '2026-10-18 10:00:00', 'a'),
+                                 announcement('TCS', '2026-10-18 12:00:00', 'b')]
+    first = nse.sync_announcements(store= tmp_path, download_attachments= False)
+    assert first['subject'].tolist() == ['a', 'b']
+    assert len(nse.sync_announcements(store= tmp_path, download_attachments= False)) == 0
+    # A new announcement on the watermark itself is still picked up, once
+    nse_site['announcements'].append(announcement('TCS', '2026-10-18 12:00:00', 'c'))
+    assert nse.sync_announcements(store= tmp_path, download_attachments= False)['subject'].tolist() == ['c']
+    assert len(nse.sync_announcements(store= tmp_path, download_attachments= False)) == 0
+
+
+def test_failed_download_is_retried_on_next_sync(nse_site, tmp_path):
+    failing = 'https://nsearchives.nseindia.com/corporate/failing.pdf'
+    nse_site['announcements'] = [announcement('TCS', '2026-10-18 10:00:00', 'a', failing),
+                                 announcement('TCS', '2026-10-18 12:00:00', 'b')]
+    nse_site['broken'].add(failing)
+    first = nse.sync_announcements(store= tmp_path)
+    assert first['subject'].tolist() == ['a', 'b']
+    assert first['attachment_path'][0] is None
+    assert first['attachment_path'][1] is not None
+    nse_site['broken'].clear()
+    second = nse.sync_announcements(store= tmp_path)
+    assert second['subject'].tolist() == ['a']
+    assert pathlib.Path(second['attachment_path'][0]).exists()
+    assert len(nse.sync_announcements(store= tmp_path)) == 0
+
+
+def test_oversized_attachment_is_not_retried(nse_site, tmp_path):
+    nse_site['announcements'] = [announcement('TCS', '2026-10-18 10:00:00', 'a')]
+    assert nse.sync_announcements(store= tmp_path, max_file_size= 1)['attachment_path'][0] is None
+    assert len(nse.sync_announcements(store= tmp_path, max_file_size= 1)) == 0
+
+
+def test_watermarks_are_kept_per_stock(nse_site, tmp_path):
+    nse_site['announcements'] = [announcement('TCS', '2026-10-18 10:00:00', 'a'),
+                                 announcement('INFY', '2026-10-18 11:00:00', 'b')]
+    tcs      = nse.Stock('TCS')
+    infy     = nse.Stock('INFY')
+    infy.symbol = 'INFY'
+    assert len(tcs.sync_announcements(store= tmp_path, download_attachments= False)) == 1
+    assert len(infy.sync_announcements(store= tmp_path, download_attachments= False)) == 1
+    assert len(nse.sync_announcements(store= tmp_path, download_attachments= False)) == 2
+    assert sorted(path.name for path in (tmp_path / 'watermarks').iterdir()) == ['ALL.json', 'INFY.json', 'TCS.json']
+    assert len(tcs.sync_announcements(store= tmp_path, download_attachments= False)) == 0
+
+
+def test_stock_symbol_is_resolved_once(nse_site, tmp_path):
+    stock = nse.Stock('tata consultancy')
+    stock.sync_announcements(store= tmp_path, download_attachments= False)
+    stock.sync_announcements(store= tmp_path, download_attachments= False)
+    assert sum('autocomplete' in url for url in nse_site['urls']) == 1
+
+
+def test_dead_link_is_not_retried(nse_site, tmp_path):
+    dead = 'https://nsearchives.nseindia.com/corporate/dead.pdf'
+    nse_site['announcements'] = [announcement('TCS', '2026-09-01 10:00:00', 'a', dead),
+                                 announcement('TCS', '2026-10-18 12:00:00', 'b')]
+    nse_site['dead'].add(dead)
+    first = nse.sync_announcements(store= tmp_path)
+    assert first['subject'].tolist() == ['a', 'b']
+    assert first['attachment_path'][0] is None
+    assert len(nse.sync_announcements(store= tmp_path)) == 0
+    assert nse_site['urls'][-1].split('from_date=')[1].startswith('18-10-2026')
+
+
+def test_attachments_share_one_session(nse_site, tmp_path):
+    nse_site['announcements'] = [announcement('TCS', f'2026-10-18 1{hour}:00:00', str(hour),
+                                              f'https://nsearchives.nseindia.com/corporate/{hour}.pdf')
+                                 for hour in range(6)]
+    result = nse.sync_announcements(store= tmp_path, max_workers= 3)
+    assert result['attachment_path'].notna().all()
+    assert len(nse_site['sessions']) == 1
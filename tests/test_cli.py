@@ -0,0 +1,120 @@
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+import pytest
+import requests
+from nsescraper import cli, store
+
+
+class Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def nse_site(monkeypatch):
+    site = {'listed': '2016-01-01', 'urls': []}
+    names = {'TCS': 'TCS', 'TATACONSULTANCY': 'TCS', 'INFY': 'INFY'}
+
+    def get(self, url= None, headers= None, **kwargs):
+        site['urls'].append(url)
+        query = parse_qs(urlparse(url).query)
+        if 'autocomplete' in url:
+            return Response({'symbols': [{'symbol': names[query['q'][0].upper()]}]})
+        if 'securityArchives' in url:
+            dates = pd.bdate_range(max(pd.to_datetime(query['from'][0], dayfirst= True), pd.Timestamp(site['listed'])),
+                                   pd.to_datetime(query['to'][0], dayfirst= True))
+            return Response({'data': [{'CH_SYMBOL': query['symbol'][0], 'CH_TIMESTAMP': day.strftime('%Y-%m-%d'),
+                                       'COP_DELIV_QTY': 1, 'COP_DELIV_PERC': 50.0, 'CH_OPENING_PRICE': 1.0,
+                                       'CH_TRADE_HIGH_PRICE': 1.0, 'CH_TRADE_LOW_PRICE': 1.0,
+                                       'CH_CLOSING_PRICE': 1.0, 'CH_LAST_TRADED_PRICE': 1.0,
+                                       'CH_PREVIOUS_CLS_PRICE': 1.0, 'CH_52WEEK_HIGH_PRICE': 1.0,
+                                       'CH_52WEEK_LOW_PRICE': 1.0, 'CH_TOT_TRADED_QTY': 1,
+                                       'CH_TOT_TRADED_VAL': 1.0, 'CH_TOTAL_TRADES': 1, 'VWAP': 1.0}
+                                      for day in dates]})
+        if 'equity-stockIndices' in url:
+            if query['index'][0] != 'NIFTY 50':
+                return Response({})
+            return Response({'data': [{'symbol': 'NIFTY 50'}, {'symbol': 'TCS'}, {'symbol': 'INFY'}]})
+        if 'chart-databyindex' in url:
+            start = pd.Timestamp('2026-10-19 09:15').value // 10 ** 6
+            return Response({'grapthData': [[start + second * 1000, 100.0 + second] for second in range(180)]})
+        return Response({})
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return site
+
+
+def test_chunks_cover_the_range_without_gaps_or_overlaps():
+    assert cli._chunks(datetime(2015, 1, 1), datetime(2015, 1, 1)) == [('01-01-2015', '01-01-2015')]
+    assert cli._chunks(datetime(2015, 1, 1), datetime(2015, 12, 31)) == [('01-01-2015', '31-12-2015')]
+    assert cli._chunks(datetime(2015, 1, 1), datetime(2017, 1, 2)) == [('01-01-2015', '31-12-2015'),
+                                                                     ('01-01-2016', '30-12-2016'),
+                                                                     ('31-12-2016', '02-01-2017')]
+    assert cli._chunks(datetime(2015, 1, 2), datetime(2015, 1, 1)) == []
+
+
+def test_run_jobs_skips_dependents_of_failed_jobs():
+    def boom(results):
+        raise SystemExit('boom')
+    jobs = {'a'      : (boom, [], False),
+            'b'      : (lambda results: 1, [], False),
+            'c'      : (lambda results: results, ['a'], False),
+            'd'      : (lambda results: results, ['c'], False),
+            'partial': (lambda results: results, ['a', 'b'], True),
+            'none'   : (lambda results: results, ['a'], True)}
+    report = cli.run_jobs(jobs, workers= 2)
+    assert report['a']['error'] == "SystemExit('boom')" and not report['a']['skipped']
+    assert report['c']['skipped'] and report['d']['skipped']
+    assert report['partial']['error'] is None and report['partial']['result'] == [None, 1]
+    assert report['none']['skipped']
+
+
+def test_empty_window_keeps_the_other_windows(nse_site, tmp_path):
+    assert cli.main(['sync', '--symbols', 'TCS', '--datasets', 'delivery', '--since', '2015-01-01',
+                     '--until', '2017-06-30', '--store', str(tmp_path)]) == 0
+    stored = store.read(tmp_path, 'delivery')
+    assert stored['date'].min() == pd.Timestamp('2016-01-01')
+    assert stored['date'].max() == pd.Timestamp('2017-06-30')
+
+
+def test_names_of_the_same_stock_are_synced_once(nse_site, tmp_path):
+    assert cli.main(['sync', '--symbols', 'tcs,TCS,tata consultancy', '--datasets', 'delivery',
+                     '--since', '2016-01-01', '--until', '2016-03-31', '--store', str(tmp_path)]) == 0
+    assert sum('securityArchives' in url for url in nse_site['urls']) == 1
+    assert [path.name for path in (tmp_path / 'delivery').iterdir()] == ['TCS.parquet']
+
+
+def test_index_dataset_needs_a_universe(nse_site, tmp_path):
+    with pytest.raises(SystemExit):
+        cli.main(['sync', '--symbols', 'TCS', '--datasets', 'index', '--store', str(tmp_path)])
+    assert nse_site['urls'] == []
+
+
+def test_unknown_universe_is_reported_without_traceback(nse_site, tmp_path, capsys):
+    with pytest.raises(SystemExit) as error:
+        cli.main(['sync', '--universe', 'NIFTY 5000', '--datasets', 'delivery', '--store', str(tmp_path)])
+    assert 'Constituents not found' in str(error.value)
+
+
+def test_index_datasets_need_a_supported_index(nse_site, tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['sync', '--universe', 'NIFTY 500', '--datasets', 'index', '--store', str(tmp_path)])
+    assert 'not available' in capsys.readouterr().err
+    assert nse_site['urls'] == []
+
+
+def test_unsupported_index_fails_the_job(monkeypatch):
+    monkeypatch.setattr(cli, 'historical_index', lambda *args: None)
+    with pytest.raises(SystemExit):
+        cli._fetch('index', None, 'NIFTY 500', '01-01-2026', '31-01-2026')
+
+
+def test_intraday_dataset(nse_site, tmp_path):
+    assert cli.main(['sync', '--universe', 'NIFTY 50', '--datasets', 'intraday', '--store', str(tmp_path)]) == 0
+    stored = store.read(tmp_path, 'intraday')
+    assert len(stored) == 3
+    assert stored['index_name'].unique().tolist() == ['NIFTY 50']
+    assert not any('equity-stockIndices' in url for url in nse_site['urls'])